@@ -231,6 +231,15 @@ def get_production_unit_from_department(department_number: int) -> str:
                 return region
     return None
 
+# Справочники в нижнем регистре, вычисляемые один раз
+_VALID_OPERATIONS_LOWER = [op.lower() for op in VALID_OPERATIONS]
+_OPERATIONS_BY_LOWER = dict(zip(_VALID_OPERATIONS_LOWER, VALID_OPERATIONS))
+_VALID_CROPS_LOWER = [c.lower() for c in VALID_CROPS]
+_CROPS_BY_LOWER = dict(zip(_VALID_CROPS_LOWER, VALID_CROPS))
+
+# Разделитель названия операции и культуры/подразделения ("под" или "по")
+_OPERATION_SUFFIX_RE = re.compile(r'\s+(?:под|по)\s+')
+
 def correct_operation(operation: str) -> str:
     """
     Корректирует название операции, используя нечеткое сравнение.
@@ -248,11 +257,11 @@ def correct_operation(operation: str) -> str:
     operation = operation.lower().strip()
     
     # Удаляем все после "под" или "по", так как это обычно относится к культуре или подразделению
-    operation = re.split(r'\s+(?:под|по)\s+', operation)[0].strip()
+    operation = _OPERATION_SUFFIX_RE.split(operation, maxsplit=1)[0].strip()
     
     # Проверяем точное совпадение
-    if operation in [op.lower() for op in VALID_OPERATIONS]:
-        return VALID_OPERATIONS[[op.lower() for op in VALID_OPERATIONS].index(operation)]
+    if operation in _OPERATIONS_BY_LOWER:
+        return _OPERATIONS_BY_LOWER[operation]
     
     # Проверяем по словарю коррекций
     for key, value in OPERATION_CORRECTIONS.items():
@@ -260,9 +269,9 @@ def correct_operation(operation: str) -> str:
             return value
     
     # Используем нечеткое сравнение для остальных операций
-    matches = difflib.get_close_matches(operation, [op.lower() for op in VALID_OPERATIONS], n=1, cutoff=0.8)
+    matches = difflib.get_close_matches(operation, _VALID_OPERATIONS_LOWER, n=1, cutoff=0.8)
     if matches:
-        return VALID_OPERATIONS[[op.lower() for op in VALID_OPERATIONS].index(matches[0])]
+        return _OPERATIONS_BY_LOWER[matches[0]]
     
     return operation
 
@@ -288,13 +297,13 @@ def correct_crop(crop: Optional[str]) -> Optional[str]:
             return full_name
             
     # Проверка точного совпадения
-    if crop in [c.lower() for c in VALID_CROPS]:
-        return VALID_CROPS[[c.lower() for c in VALID_CROPS].index(crop)]
+    if crop in _CROPS_BY_LOWER:
+        return _CROPS_BY_LOWER[crop]
         
     # Нечеткое сравнение
-    matches = difflib.get_close_matches(crop, [c.lower() for c in VALID_CROPS], n=1, cutoff=0.8)
+    matches = difflib.get_close_matches(crop, _VALID_CROPS_LOWER, n=1, cutoff=0.8)
     if matches:
-        return VALID_CROPS[[c.lower() for c in VALID_CROPS].index(matches[0])]
+        return _CROPS_BY_LOWER[matches[0]]
         
     return None
 
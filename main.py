@@ -9,14 +9,61 @@ import os
 import sys
 import json
 import logging
+import logging.handlers
 import argparse
+from collections import Counter
 from typing import Dict, Any, List, Optional, Union
 
-from utils.input_processor import load_input_json
-from utils.text_parser import parse_messages
-from utils.validator import validate_parsed_data
-from utils.error_handler import handle_errors
-from utils.output_formatter import format_output
+# Поля, пропуски в которых учитываются в сводке
+_SUMMARY_FIELDS = ("date", "division", "operation", "crop", "dailyArea", "totalArea")
+
+class BufferedFileHandler(logging.handlers.MemoryHandler):
+    """
+    Буферизованный файловый обработчик логов.
+    
+    Записи накапливаются в памяти и сбрасываются в файл одной операцией
+    записи при заполнении буфера, при появлении записи уровня flushLevel
+    или выше и при закрытии обработчика.
+    """
+    
+    def __init__(self, filename: str, capacity: int = 1000,
+                 flushLevel: int = logging.ERROR, encoding: str = 'utf-8') -> None:
+        super().__init__(
+            capacity,
+            flushLevel=flushLevel,
+            target=logging.FileHandler(filename, encoding=encoding)
+        )
+        
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+        
+    def flush(self) -> None:
+        """Запись накопленных сообщений в файл одним вызовом write."""
+        with self.lock:
+            if not self.target or not self.buffer:
+                return
+            # Ошибка форматирования одной записи не должна терять остальные
+            lines = []
+            for record in self.buffer:
+                try:
+                    lines.append(self.target.format(record) + self.target.terminator)
+                except Exception:
+                    self.handleError(record)
+            try:
+                self.target.stream.write(''.join(lines))
+                self.target.flush()
+            except Exception:
+                self.handleError(self.buffer[-1])
+            self.buffer.clear()
+            
+    def close(self) -> None:
+        target = self.target
+        try:
+            super().close()
+        finally:
+            if target:
+                target.close()
 
 def setup_logging(verbose: bool = False) -> None:
     """
@@ -35,7 +82,9 @@ def setup_logging(verbose: bool = False) -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
     
-    # Очищаем существующие обработчики
+    # Очищаем существующие обработчики, сбрасывая их буферы
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers = []
     
     # Консольный обработчик
@@ -44,8 +93,8 @@ def setup_logging(verbose: bool = False) -> None:
     console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
     root_logger.addHandler(console_handler)
     
-    # Файловый обработчик
-    file_handler = logging.FileHandler('app.log', encoding='utf-8')
+    # Файловый обработчик (буферизованный, сбрасывается при ошибках)
+    file_handler = BufferedFileHandler('app.log')
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)  # Всегда пишем подробные логи в файл
     root_logger.addHandler(file_handler)
@@ -78,6 +127,11 @@ def setup_argument_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='Включить подробное логирование'
     )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Сохранить выходной JSON с отступами (по умолчанию компактный вывод)'
+    )
     return parser
 
 def process_data(input_data: Union[str, Dict[str, List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -96,6 +150,14 @@ def process_data(input_data: Union[str, Dict[str, List[Dict[str, Any]]]]) -> Dic
     if input_data is None:
         raise ValueError("Входные данные не могут быть None")
         
+    # Модули конвейера загружаются только при фактической обработке,
+    # чтобы --help и ранние ошибки не платили за их импорт
+    from utils.input_processor import load_input_json
+    from utils.text_parser import parse_messages
+    from utils.validator import validate_parsed_data
+    from utils.error_handler import handle_errors
+    from utils.output_formatter import format_output
+    
     logger = logging.getLogger(__name__)
     try:
         # Если input_data - строка, считаем это путем к файлу
@@ -139,40 +201,30 @@ def print_processing_summary(data: Dict[str, List[Dict[str, Any]]]) -> None:
     logger.info("\n=== Сводка по обработанным данным ===")
     
     total_messages = len(data["reports"])
-    total_operations = sum(len(report["parsed"]) for report in data["reports"])
+    total_operations = 0
     
+    # Статистика по типам операций и пропущенным данным за один проход
+    operation_stats = Counter()
+    missing_counts = [0] * len(_SUMMARY_FIELDS)
+    
+    for report in data["reports"]:
+        operations = report["parsed"]
+        total_operations += len(operations)
+        for operation in operations:
+            operation_stats[operation.get("operation", "Неизвестно")] += 1
+            for i, field in enumerate(_SUMMARY_FIELDS):
+                if not operation.get(field):
+                    missing_counts[i] += 1
+                    
     logger.info(f"Всего обработано сообщений: {total_messages}")
     logger.info(f"Всего извлечено операций: {total_operations}")
     
-    # Статистика по типам операций
-    operation_stats = {}
-    for report in data["reports"]:
-        for operation in report["parsed"]:
-            op_type = operation.get("operation", "Неизвестно")
-            operation_stats[op_type] = operation_stats.get(op_type, 0) + 1
-            
     logger.info("\nСтатистика по операциям:")
     for op_type, count in operation_stats.items():
         logger.info(f"  {op_type}: {count}")
         
-    # Проверка на пропущенные данные
-    missing_data = {
-        "date": 0,
-        "division": 0,
-        "operation": 0,
-        "crop": 0,
-        "dailyArea": 0,
-        "totalArea": 0
-    }
-    
-    for report in data["reports"]:
-        for operation in report["parsed"]:
-            for field in missing_data:
-                if not operation.get(field):
-                    missing_data[field] += 1
-                    
     logger.info("\nПропущенные данные:")
-    for field, count in missing_data.items():
+    for field, count in zip(_SUMMARY_FIELDS, missing_counts):
         if count > 0:
             logger.warning(f"  {field}: {count} пропусков")
             
@@ -195,6 +247,8 @@ def main():
             sys.exit(1)
             
         # Загрузка входных данных
+        from utils.input_processor import load_input_json
+        
         logger.info(f"Загрузка данных из файла: {args.input_file}")
         input_data = load_input_json(args.input_file)
         
@@ -207,7 +261,10 @@ def main():
         # Сохранение результатов
         logger.info(f"Сохранение результатов в файл: {args.output}")
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(processed_data, f, ensure_ascii=False, indent=2)
+            if args.pretty:
+                json.dump(processed_data, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(processed_data, f, ensure_ascii=False, separators=(',', ':'))
             
         # Вывод сводки
         print_processing_summary(processed_data)
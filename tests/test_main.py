@@ -1,11 +1,13 @@
 import unittest
 import json
+import logging
 import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
-from main import process_data, main
+import utils.text_parser as text_parser
+from main import BufferedFileHandler, process_data, main
 
 class TestAgriculturalDataProcessor(unittest.TestCase):
     def setUp(self):
@@ -55,6 +57,23 @@ class TestAgriculturalDataProcessor(unittest.TestCase):
                 main()
                 mock_dump.assert_called_once()
 
+    @patch('sys.argv', ['main.py', 'tests/test_data.json', '--pretty'])
+    def test_main_pretty_output(self):
+        """Тест вывода JSON с отступами"""
+        with patch('builtins.open', mock_open(read_data=json.dumps(self.test_data))):
+            with patch('json.dump') as mock_dump:
+                main()
+                self.assertEqual(mock_dump.call_args.kwargs.get('indent'), 2)
+
+    @patch('sys.argv', ['main.py', 'tests/test_data.json'])
+    def test_main_compact_output(self):
+        """Тест компактного вывода JSON по умолчанию"""
+        with patch('builtins.open', mock_open(read_data=json.dumps(self.test_data))):
+            with patch('json.dump') as mock_dump:
+                main()
+                self.assertNotIn('indent', mock_dump.call_args.kwargs)
+                self.assertEqual(mock_dump.call_args.kwargs.get('separators'), (',', ':'))
+
     @patch('sys.argv', ['main.py', 'nonexistent_file.json'])
     def test_main_file_not_found(self):
         """Тест обработки отсутствующего файла"""
@@ -70,5 +89,97 @@ class TestAgriculturalDataProcessor(unittest.TestCase):
                 main()
             self.assertEqual(cm.exception.code, 1)
 
+    def test_parallel_parse_warnings_reach_file_log(self):
+        """Тест записи предупреждений из процессов пула в файловый журнал"""
+        log_path = Path(self.temp_dir.name) / "app.log"
+        messages = [{"id": i, "payload": "123 нераспознанный блок"} for i in range(40)]
+        
+        root_logger = logging.getLogger()
+        old_level = root_logger.level
+        file_handler = BufferedFileHandler(str(log_path))
+        root_logger.addHandler(file_handler)
+        root_logger.setLevel(logging.INFO)
+        try:
+            with patch.object(text_parser, 'PARALLEL_PARSE_THRESHOLD', 0), \
+                 patch.object(text_parser, 'PARALLEL_PARSE_CHUNKSIZE', 8), \
+                 patch.object(text_parser.os, 'cpu_count', return_value=4), \
+                 patch.object(text_parser, '_parse_payloads_parallel',
+                              wraps=text_parser._parse_payloads_parallel) as parallel:
+                text_parser.parse_messages({"messages": messages})
+            parallel.assert_called_once()
+        finally:
+            root_logger.removeHandler(file_handler)
+            file_handler.close()
+            root_logger.setLevel(old_level)
+            
+        log_text = log_path.read_text(encoding='utf-8')
+        self.assertEqual(log_text.count("Не удалось распознать операцию"), len(messages))
+
+class TestBufferedFileHandler(unittest.TestCase):
+    def setUp(self):
+        """Подготовка временного файла журнала"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.temp_dir.name) / "app.log"
+        
+    def tearDown(self):
+        """Очистка временных файлов"""
+        self.temp_dir.cleanup()
+        
+    def _record(self, msg, args=(), level=logging.INFO):
+        return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+        
+    def _read_lines(self):
+        return self.log_path.read_text(encoding='utf-8').splitlines()
+        
+    def test_flush_on_capacity(self):
+        """Тест сброса буфера при заполнении"""
+        handler = BufferedFileHandler(str(self.log_path), capacity=3)
+        try:
+            handler.handle(self._record("первая"))
+            handler.handle(self._record("вторая"))
+            self.assertEqual(self._read_lines(), [])
+            handler.handle(self._record("третья"))
+            self.assertEqual(self._read_lines(), ["первая", "вторая", "третья"])
+        finally:
+            handler.close()
+            
+    def test_flush_on_error_level(self):
+        """Тест сброса буфера при записи уровня ERROR"""
+        handler = BufferedFileHandler(str(self.log_path))
+        try:
+            handler.handle(self._record("информация"))
+            self.assertEqual(self._read_lines(), [])
+            handler.handle(self._record("ошибка", level=logging.ERROR))
+            self.assertEqual(self._read_lines(), ["информация", "ошибка"])
+        finally:
+            handler.close()
+            
+    def test_flush_on_close(self):
+        """Тест сброса буфера при закрытии"""
+        handler = BufferedFileHandler(str(self.log_path))
+        handler.handle(self._record("информация"))
+        self.assertEqual(self._read_lines(), [])
+        handler.close()
+        self.assertEqual(self._read_lines(), ["информация"])
+        
+    def test_bad_record_does_not_drop_buffer(self):
+        """Тест: ошибка форматирования одной записи не теряет остальные"""
+        handler = BufferedFileHandler(str(self.log_path))
+        bad_record = self._record("число %d", ("не число",))
+        records = (
+            [self._record("до %s", (i,)) for i in range(5)]
+            + [bad_record]
+            + [self._record("после %s", (i,)) for i in range(5)]
+        )
+        with patch.object(handler, 'handleError') as handle_error:
+            for record in records:
+                handler.handle(record)
+            handler.close()
+        handle_error.assert_called_once_with(bad_record)
+        self.assertEqual(
+            self._read_lines(),
+            [f"до {i}" for i in range(5)] + [f"после {i}" for i in range(5)]
+        )
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -12,9 +12,12 @@ import unittest
 from typing import Dict, Any, List
 
 from utils.input_processor import load_input_json as load_input
-from utils.text_parser import parse_messages
-from utils.validator import validate_parsed_data
-from utils.error_handler import handle_errors
+from utils.text_parser import (
+    parse_messages, iter_parse_messages, parse_date, parse_message_payload,
+    _DATE_RE, _DATE_SEARCH_WINDOW, _search_payload_date
+)
+from utils.validator import validate_parsed_data, iter_validate_parsed_data
+from utils.error_handler import handle_errors, correct_date_format
 from utils.output_formatter import format_output
 
 # Настройка логирования
@@ -133,6 +136,72 @@ class TestDataProcessingPipeline(unittest.TestCase):
         except Exception as e:
             self.fail(f"Ошибка в конвейере обработки данных: {str(e)}")
             
+    def test_streaming_pipeline(self):
+        """Тест потокового парсинга и валидации."""
+        input_data = load_input(self.test_input_file)
+        
+        # Потоковые функции должны давать тот же результат, что и списочные
+        expected = validate_parsed_data(parse_messages(input_data))
+        streamed = iter_validate_parsed_data(iter_parse_messages(load_input(self.test_input_file)))
+        self.assertNotIsInstance(streamed, list)
+        self.assertEqual(list(streamed), expected)
+        
+    def test_parse_date(self):
+        """Тест разбора дат в форматах DD.MM и ISO."""
+        valid_dates = {
+            "12.04": "12.04",
+            "1.4": "01.04",
+            "12.04.2025": "12.04",
+            "29.02": "29.02",
+            "31.12": "31.12",
+            "2025-04-12": "12.04",
+        }
+        for date_str, expected in valid_dates.items():
+            with self.subTest(date=date_str):
+                self.assertEqual(parse_date(date_str), expected)
+                
+        # Несуществующие дни и месяцы отклоняются
+        for date_str in ("31.04", "30.02", "00.04", "13.13", "2025-13-40", "2025-04-31"):
+            with self.subTest(date=date_str):
+                self.assertIsNone(parse_date(date_str))
+                
+    def test_invalid_message_date_not_replaced(self):
+        """Тест: некорректная дата сообщения не заменяется датой из текста."""
+        payload = "Пахота под оз пш\nОтд 1 5/10"
+        for date_str in ("2025-04-31", "2025-13-40"):
+            with self.subTest(date=date_str):
+                operations = parse_message_payload(payload, date_str)
+                self.assertEqual(len(operations), 1)
+                self.assertIsNone(operations[0]["date"])
+                
+    def test_payload_date_search_window(self):
+        """Тест поиска даты в начале текста: результат как при поиске по всему тексту."""
+        filler = "а" * _DATE_SEARCH_WINDOW
+        cases = {
+            # Дата целиком внутри окна, за окном - площади вида "5/10"
+            "внутри окна": (filler[:10] + "12.04.2025 " + filler + " Отд 1 5/10", "12.04.2025"),
+            # Окно обрезает дату до "12.0"
+            "пересекает границу": (filler[:60] + "12.04 " + filler, "12.04"),
+            # Окно обрезает часть ".2025" с годом
+            "год за границей": (filler[:56] + "12.04.2025 " + filler, "12.04.2025"),
+            "после окна": (filler + filler + " 12.04", "12.04"),
+        }
+        for name, (payload, expected) in cases.items():
+            with self.subTest(case=name):
+                date_match = _search_payload_date(payload)
+                self.assertEqual(date_match.group(0), expected)
+                self.assertEqual(date_match.span(), _DATE_RE.search(payload).span())
+                
+    def test_correct_date_format(self):
+        """Тест корректировки формата даты."""
+        self.assertEqual(correct_date_format("2025-04-12"), "12.04.2025")
+        self.assertEqual(correct_date_format("12/04/2025"), "12.04.2025")
+        
+        # Строки, похожие на ISO, обрабатываются общими шаблонами
+        for date_str in ("25-04-12", "2025-4a-01"):
+            with self.subTest(date=date_str):
+                self.assertIsNone(correct_date_format(date_str))
+            
     def _print_summary(self, data: Dict[str, List[Dict[str, Any]]]):
         """Вывод сводки по обработанным данным."""
         logger.info("\n=== Сводка по обработанным данным ===")
@@ -154,5 +223,69 @@ class TestDataProcessingPipeline(unittest.TestCase):
                 
         logger.info("\n=== Конец сводки ===\n")
 
+class TestErrorHandling(unittest.TestCase):
+    """Тесты пропуска обработки ошибок для корректных сообщений."""
+    
+    @staticmethod
+    def _operation(**fields):
+        """Корректная операция с измененными полями."""
+        operation = {
+            "date": "12.04",
+            "division": "АОР",
+            "operation": "Пахота",
+            "crop": "Многолетние травы",
+            "dailyArea": 10,
+            "totalArea": 100,
+            "dailyYield": None,
+            "totalYield": None
+        }
+        operation.update(fields)
+        return operation
+        
+    def _handle(self, operations):
+        message = {"message_number": 1, "payload": "", "parsed": operations}
+        corrected = handle_errors([message])
+        self.assertEqual(len(corrected), 1)
+        return message, corrected[0]
+        
+    def test_clean_message_passed_through(self):
+        """Тест: сообщение без ошибок возвращается тем же объектом."""
+        message, corrected = self._handle([self._operation(), self._operation(dailyArea=5)])
+        self.assertIs(corrected, message)
+        
+    def test_corrections_applied(self):
+        """Тест: сообщения с ошибками обрабатываются полным путем."""
+        op = self._operation
+        cases = {
+            "отсутствующее поле": (
+                [op(), op(division=None)], [op(), op()]
+            ),
+            "пустая дата": ([op(date="")], [op(date=None)]),
+            "дата ISO": ([op(date="2025-04-12")], [op(date="12.04.2025")]),
+            "несовместимая культура": (
+                [op(operation="Сев", crop="Пшеница")],
+                [op(operation="Сев", crop="Озимая пшеница")]
+            ),
+            "неизвестная операция": (
+                [op(operation="Дискование", crop="Соя")],
+                [op(operation="Дискование", crop="Соя")]
+            ),
+            "дневная площадь больше общей": (
+                [op(dailyArea=200, totalArea=100)],
+                [op(dailyArea=100, totalArea=200)]
+            ),
+            "высокая урожайность": (
+                [op(dailyYield=150, totalYield=40)],
+                [op(dailyYield=15.0, totalYield=40)]
+            ),
+            # Операция с нечисловой площадью отбрасывается
+            "нечисловая площадь": ([op(dailyArea="abc")], []),
+        }
+        for name, (operations, expected) in cases.items():
+            with self.subTest(case=name):
+                message, corrected = self._handle(operations)
+                self.assertIsNot(corrected, message)
+                self.assertEqual(corrected["parsed"], expected)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -7,11 +7,21 @@
 
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Скомпилированные шаблоны поддерживаемых форматов даты
+_DATE_PATTERNS = (
+    re.compile(r'(\d{1,2})[./](\d{1,2})[./](\d{4})'),  # DD.MM.YYYY
+    re.compile(r'(\d{1,2})[./](\d{1,2})[./](\d{2})'),  # DD.MM.YY
+    re.compile(r'(\d{1,2})[./](\d{1,2})')               # DD.MM
+)
+
+# Даты, которые correct_date_format возвращает без изменений (DD.MM или DD.MM.YYYY)
+_NORMALIZED_DATE_PATTERN = re.compile(r'\d{2}\.\d{2}(?:\.\d{4})?')
+
 # Словарь совместимости операций и культур
 OPERATION_CROP_COMPATIBILITY = {
     "Пахота": ["Многолетние травы", "Озимая пшеница", "Озимый ячмень", "Яровой ячмень"],
@@ -23,6 +33,17 @@ OPERATION_CROP_COMPATIBILITY = {
     "Внесение минеральных удобрений": ["Озимая пшеница", "Озимый ячмень", "Яровой ячмень", "Горох"]
 }
 
+# Индексы совместимости: множества для проверки вхождения и заранее
+# приведенные к нижнему регистру названия для поиска похожей культуры
+_COMPATIBLE_CROPS = {
+    operation: frozenset(crops)
+    for operation, crops in OPERATION_CROP_COMPATIBILITY.items()
+}
+_COMPATIBLE_CROPS_LOWER = {
+    operation: tuple((crop.lower(), crop) for crop in crops)
+    for operation, crops in OPERATION_CROP_COMPATIBILITY.items()
+}
+
 def handle_errors(validated_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Обработка ошибок в валидированных данных.
@@ -42,8 +63,20 @@ def handle_errors(validated_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             if not operations:
                 continue
                 
+            # Заполненные поля операций; используются и при проверке,
+            # и при заполнении отсутствующих полей
+            present_keys = [_present_keys(operation) for operation in operations]
+            common_keys = set().union(*present_keys)
+            
+            # Сообщение без ошибок передается дальше без изменений
+            if not _needs_correction(operations, present_keys, common_keys):
+                corrected_data.append(message)
+                continue
+                
             # Проверка отсутствующих полей
-            operations = check_missing_fields(operations, message.get('payload', ''))
+            operations = check_missing_fields(
+                operations, message.get('payload', ''), present_keys, common_keys
+            )
             
             # Применение согласованности дат
             operations = apply_date_consistency(operations)
@@ -61,11 +94,69 @@ def handle_errors(validated_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             corrected_data.append(corrected_message)
             
         except Exception as e:
-            logger.error(f"Ошибка при обработке сообщения: {str(e)}")
+            logger.error("Ошибка при обработке сообщения: %s", e)
             continue
             
     return corrected_data
 
+def _needs_correction(operations: List[Dict[str, Any]], present_keys: List[Set[str]],
+                      common_keys: Set[str]) -> bool:
+    """
+    Проверка, изменит ли обработка ошибок хотя бы одну операцию.
+    
+    Args:
+        operations (List[Dict[str, Any]]): Список операций сообщения
+        present_keys (List[Set[str]]): Заполненные поля каждой операции
+        common_keys (Set[str]): Поля, заполненные хотя бы в одной операции;
+            check_missing_fields заполнил бы их в остальных операциях
+        
+    Returns:
+        bool: False, если все операции уже согласованы и корректны
+    """
+    try:
+        for operation, present in zip(operations, present_keys):
+            if not operation or not common_keys <= present:
+                return True
+                
+            date = operation.get('date')
+            if date is not None and not (
+                isinstance(date, str) and _NORMALIZED_DATE_PATTERN.fullmatch(date)
+            ):
+                return True
+                
+            operation_type = operation.get('operation')
+            crop = operation.get('crop')
+            if operation_type and crop and crop not in _COMPATIBLE_CROPS.get(operation_type, ()):
+                return True
+                
+            daily_area = operation.get('dailyArea')
+            total_area = operation.get('totalArea')
+            if daily_area is not None and total_area is not None and daily_area > total_area:
+                return True
+                
+            for field in ('dailyYield', 'totalYield'):
+                value = operation.get(field)
+                if value is not None and value > 100:
+                    return True
+                    
+    except TypeError:
+        # Нечисловые значения обрабатываются полным путем
+        return True
+        
+    return False
+
+def _present_keys(operation: Dict[str, Any]) -> Set[str]:
+    """
+    Множество полей операции, имеющих значение (не None).
+    
+    Args:
+        operation (Dict[str, Any]): Операция
+        
+    Returns:
+        Set[str]: Заполненные поля операции
+    """
+    return {key for key, value in operation.items() if value is not None}
+
 def correct_operation(operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Корректировка отдельной операции.
@@ -92,7 +183,7 @@ def correct_operation(operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return corrected
         
     except Exception as e:
-        logger.error(f"Ошибка при корректировке операции: {str(e)}")
+        logger.error("Ошибка при корректировке операции: %s", e)
         return None
 
 def correct_date_format(date_str: Optional[str]) -> Optional[str]:
@@ -109,15 +200,17 @@ def correct_date_format(date_str: Optional[str]) -> Optional[str]:
         return None
         
     try:
+        # Быстрый путь для ISO формата (YYYY-MM-DD)
+        if '-' in date_str:
+            parts = date_str.split('-')
+            if (len(parts) == 3 and len(parts[0]) == 4
+                    and parts[0].isdecimal() and parts[1].isdecimal() and parts[2].isdecimal()):
+                year, month, day = parts
+                return f"{day.zfill(2)}.{month.zfill(2)}.{year}"
+                
         # Разбор различных форматов даты
-        patterns = [
-            r'(\d{1,2})[\./](\d{1,2})[\./](\d{4})',  # DD.MM.YYYY
-            r'(\d{1,2})[\./](\d{1,2})[\./](\d{2})',  # DD.MM.YY
-            r'(\d{1,2})[\./](\d{1,2})'                # DD.MM
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, date_str)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.match(date_str)
             if match:
                 day, month, *year = match.groups()
                 day = day.zfill(2)
@@ -131,89 +224,97 @@ def correct_date_format(date_str: Optional[str]) -> Optional[str]:
                 else:
                     return f"{day}.{month}"
                     
-        logger.warning(f"Не удалось распознать формат даты: {date_str}")
+        logger.warning("Не удалось распознать формат даты: %s", date_str)
         return None
         
     except Exception as e:
-        logger.error(f"Ошибка при корректировке даты: {str(e)}")
+        logger.error("Ошибка при корректировке даты: %s", e)
         return None
 
 def check_crop_operation_consistency(operation: Dict[str, Any]) -> Dict[str, Any]:
     """
     Проверка совместимости культуры и операции.
     
+    Операция изменяется на месте.
+    
     Args:
         operation (Dict[str, Any]): Операция для проверки
         
     Returns:
         Dict[str, Any]: Исправленная операция
     """
-    corrected = operation.copy()
-    operation_type = corrected.get('operation')
-    crop = corrected.get('crop')
+    operation_type = operation.get('operation')
+    crop = operation.get('crop')
     
     if not operation_type or not crop:
-        return corrected
+        return operation
         
     # Проверка совместимости
-    compatible_crops = OPERATION_CROP_COMPATIBILITY.get(operation_type, [])
-    if crop not in compatible_crops:
-        logger.warning(f"Несовместимая пара операция-культура: {operation_type} - {crop}")
+    if crop not in _COMPATIBLE_CROPS.get(operation_type, ()):
+        logger.warning("Несовместимая пара операция-культура: %s - %s", operation_type, crop)
         
         # Попытка найти совместимую культуру
-        for compatible_crop in compatible_crops:
-            if crop.lower() in compatible_crop.lower() or compatible_crop.lower() in crop.lower():
-                logger.info(f"Исправлена культура: {crop} -> {compatible_crop}")
-                corrected['crop'] = compatible_crop
+        crop_lower = crop.lower()
+        for compatible_lower, compatible_crop in _COMPATIBLE_CROPS_LOWER.get(operation_type, ()):
+            if crop_lower in compatible_lower or compatible_lower in crop_lower:
+                logger.info("Исправлена культура: %s -> %s", crop, compatible_crop)
+                operation['crop'] = compatible_crop
                 break
                 
-    return corrected
+    return operation
 
 def check_numeric_consistency(operation: Dict[str, Any]) -> Dict[str, Any]:
     """
     Проверка числовой согласованности.
     
+    Операция изменяется на месте.
+    
     Args:
         operation (Dict[str, Any]): Операция для проверки
         
     Returns:
         Dict[str, Any]: Исправленная операция
     """
-    corrected = operation.copy()
-    
     # Проверка площадей
-    daily_area = corrected.get('dailyArea')
-    total_area = corrected.get('totalArea')
+    daily_area = operation.get('dailyArea')
+    total_area = operation.get('totalArea')
     
     if daily_area is not None and total_area is not None:
         if daily_area > total_area:
-            logger.warning(f"Дневная площадь ({daily_area}) больше общей ({total_area})")
+            logger.warning("Дневная площадь (%s) больше общей (%s)", daily_area, total_area)
             # Меняем местами значения
-            corrected['dailyArea'], corrected['totalArea'] = total_area, daily_area
+            operation['dailyArea'], operation['totalArea'] = total_area, daily_area
             
     # Проверка урожайности
-    daily_yield = corrected.get('dailyYield')
-    total_yield = corrected.get('totalYield')
+    daily_yield = operation.get('dailyYield')
+    total_yield = operation.get('totalYield')
     
     if daily_yield is not None:
         if daily_yield > 100:  # Нереалистично высокая урожайность
-            logger.warning(f"Нереалистично высокая дневная урожайность: {daily_yield}")
-            corrected['dailyYield'] = daily_yield / 10  # Уменьшаем в 10 раз
+            logger.warning("Нереалистично высокая дневная урожайность: %s", daily_yield)
+            operation['dailyYield'] = daily_yield / 10  # Уменьшаем в 10 раз
             
     if total_yield is not None:
         if total_yield > 100:  # Нереалистично высокая урожайность
-            logger.warning(f"Нереалистично высокая общая урожайность: {total_yield}")
-            corrected['totalYield'] = total_yield / 10  # Уменьшаем в 10 раз
+            logger.warning("Нереалистично высокая общая урожайность: %s", total_yield)
+            operation['totalYield'] = total_yield / 10  # Уменьшаем в 10 раз
             
-    return corrected
+    return operation
 
-def check_missing_fields(operations: List[Dict[str, Any]], payload: str) -> List[Dict[str, Any]]:
+def check_missing_fields(operations: List[Dict[str, Any]], payload: str,
+                         present_keys: Optional[List[Set[str]]] = None,
+                         common_keys: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
     """
     Проверка отсутствующих полей.
     
+    Операции изменяются на месте.
+    
     Args:
         operations (List[Dict[str, Any]]): Список операций
         payload (str): Исходный текст
+        present_keys (Optional[List[Set[str]]]): Заполненные поля каждой
+            операции, если они уже вычислены вызывающим кодом
+        common_keys (Optional[Set[str]]): Объединение present_keys
         
     Returns:
         List[Dict[str, Any]]: Операции с заполненными полями
@@ -221,6 +322,20 @@ def check_missing_fields(operations: List[Dict[str, Any]], payload: str) -> List
     if not operations:
         return operations
         
+    if present_keys is None:
+        present_keys = [_present_keys(operation) for operation in operations]
+    if common_keys is None:
+        common_keys = set().union(*present_keys)
+        
+    # Операции, в которых не заполнены поля, имеющиеся в других операциях
+    incomplete = [
+        (operation, present)
+        for operation, present in zip(operations, present_keys)
+        if not common_keys <= present
+    ]
+    if not incomplete:
+        return operations
+        
     # Определение общих полей из других операций
     common_fields = {}
     for operation in operations:
@@ -228,51 +343,47 @@ def check_missing_fields(operations: List[Dict[str, Any]], payload: str) -> List
             if value is not None:
                 common_fields[key] = value
                 
-    # Заполнение отсутствующих полей
-    corrected_operations = []
-    for operation in operations:
-        corrected = operation.copy()
+    # Заполнение отсутствующих полей общими значениями
+    log_info = logger.info
+    log_fills = logger.isEnabledFor(logging.INFO)
+    for operation, present in incomplete:
+        missing_fields = {
+            key: value for key, value in common_fields.items()
+            if key not in present
+        }
         
-        # Заполнение отсутствующих полей общими значениями
-        for key, value in common_fields.items():
-            if key not in corrected or corrected[key] is None:
-                corrected[key] = value
-                logger.info(f"Заполнено отсутствующее поле {key}: {value}")
-                
-        corrected_operations.append(corrected)
+        operation.update(missing_fields)
+        if log_fills:
+            for key, value in missing_fields.items():
+                log_info("Заполнено отсутствующее поле %s: %s", key, value)
         
-    return corrected_operations
+    return operations
 
 def apply_date_consistency(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Применение согласованности дат.
     
+    Операции изменяются на месте.
+    
     Args:
         operations (List[Dict[str, Any]]): Список операций
         
     Returns:
         List[Dict[str, Any]]: Операции с согласованными датами
     """
-    if not operations:
+    # Поиск первой валидной даты
+    base_date = next(
+        (operation['date'] for operation in operations if operation.get('date')),
+        None
+    )
+    if not base_date:
         return operations
         
-    # Поиск первой валидной даты
-    base_date = None
+    # Применение базовой даты к операциям без даты
+    log_info = logger.info
     for operation in operations:
-        if operation.get('date'):
-            base_date = operation['date']
-            break
-            
-    # Применение базовой даты ко всем операциям
-    if base_date:
-        corrected_operations = []
-        for operation in operations:
-            corrected = operation.copy()
-            if not corrected.get('date'):
-                corrected['date'] = base_date
-                logger.info(f"Заполнена отсутствующая дата: {base_date}")
-            corrected_operations.append(corrected)
+        if not operation.get('date'):
+            operation['date'] = base_date
+            log_info("Заполнена отсутствующая дата: %s", base_date)
             
-        return corrected_operations
-        
-    return operations 
\ No newline at end of file
+    return operations
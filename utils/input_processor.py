@@ -7,11 +7,49 @@
 
 import json
 import logging
+import mmap
 from pathlib import Path
-from typing import Dict, List, Union, Any
+from typing import BinaryIO, Dict, Iterator, List, Union, Any
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    # orjson разбирает буфер напрямую, без копирования в bytes
+    _JSON_LOADS_ACCEPTS_BUFFER = True
+except ImportError:  # orjson не установлен - используем стандартный модуль json
+    _json_loads = json.loads
+    _JSON_LOADS_ACCEPTS_BUFFER = False
 
 logger = logging.getLogger(__name__)
 
+# Необязательные поля, переносимые в подготовленное сообщение
+_OPTIONAL_MESSAGE_FIELDS = ('id', 'source', 'timestamp')
+
+def _load_json_file(f: BinaryIO) -> Any:
+    """
+    Разбор JSON из открытого в двоичном режиме файла.
+    
+    Если парсер принимает буфер, файл отображается в память и разбирается
+    без промежуточной копии содержимого. Если отображение недоступно
+    (пустой файл, объект без файлового дескриптора), файл читается целиком.
+    
+    Args:
+        f (BinaryIO): Файл, открытый в режиме 'rb'
+        
+    Returns:
+        Any: Разобранные данные
+    """
+    if _JSON_LOADS_ACCEPTS_BUFFER:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        else:
+            with mapped, memoryview(mapped) as buffer:
+                return _json_loads(buffer)
+                
+    return _json_loads(f.read())
+
 def load_input_json(file_path: Union[str, Path]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Загрузка и валидация входного JSON файла.
@@ -35,16 +73,20 @@ def load_input_json(file_path: Union[str, Path]) -> Dict[str, List[Dict[str, Any
         if not file_path.exists():
             raise FileNotFoundError(f"Файл не найден: {file_path}")
             
-        # Чтение и парсинг JSON
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Чтение и парсинг JSON (байты декодируются парсером)
+        with open(file_path, 'rb') as f:
+            data = _load_json_file(f)
             
-        # Проверка наличия ключа 'messages' или 'reports'
-        if 'messages' not in data and 'reports' not in data:
+        # Определение ключа со списком сообщений ('messages' или 'reports')
+        if 'messages' in data:
+            messages_key = 'messages'
+        elif 'reports' in data:
+            messages_key = 'reports'
+        else:
             raise ValueError("Входной файл должен содержать ключ 'messages' или 'reports'")
             
         # Получение списка сообщений
-        messages = data.get('messages', data.get('reports', []))
+        messages = data[messages_key]
         
         # Проверка типа данных
         if not isinstance(messages, list):
@@ -78,47 +120,69 @@ def load_input_json(file_path: Union[str, Path]) -> Dict[str, List[Dict[str, Any
         logger.error(f"Неожиданная ошибка при загрузке файла: {str(e)}")
         raise
 
-def prepare_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+def iter_prepared_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
     """
-    Подготовка и нормализация сообщений.
+    Последовательная подготовка и нормализация сообщений.
+    
+    В отличие от prepare_messages не создает промежуточный список:
+    каждое сообщение нормализуется непосредственно перед его обработкой.
     
     Args:
         input_data (Dict[str, List[Dict[str, Any]]]): Входные данные
         
-    Returns:
-        List[Dict[str, Any]]: Подготовленные сообщения
+    Yields:
+        Dict[str, Any]: Подготовленное сообщение
         
     Raises:
         ValueError: Если данные не могут быть нормализованы
     """
     try:
         # Получение списка сообщений
-        messages = input_data.get('messages', input_data.get('reports', []))
-        prepared_messages = []
+        messages = (
+            input_data['messages'] if 'messages' in input_data
+            else input_data.get('reports', [])
+        )
         
         for message in messages:
             # Создание базовой структуры сообщения
             prepared_message = {
-                'message_number': message.get('message_number', message.get('id')),
+                'message_number': (
+                    message['message_number'] if 'message_number' in message
+                    else message.get('id')
+                ),
                 'date': message.get('date', ''),
                 'payload': message.get('payload', ''),
                 'parsed': []  # Для хранения результатов парсинга
             }
             
             # Добавление дополнительных полей, если они существуют
-            for key in ['id', 'source', 'timestamp']:
+            for key in _OPTIONAL_MESSAGE_FIELDS:
                 if key in message:
                     prepared_message[key] = message[key]
                     
-            prepared_messages.append(prepared_message)
+            yield prepared_message
             
-        logger.info(f"Подготовлено {len(prepared_messages)} сообщений")
-        return prepared_messages
-        
     except Exception as e:
         logger.error(f"Ошибка при подготовке сообщений: {str(e)}")
         raise ValueError(f"Ошибка при подготовке сообщений: {str(e)}")
 
+def prepare_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Подготовка и нормализация сообщений.
+    
+    Args:
+        input_data (Dict[str, List[Dict[str, Any]]]): Входные данные
+        
+    Returns:
+        List[Dict[str, Any]]: Подготовленные сообщения
+        
+    Raises:
+        ValueError: Если данные не могут быть нормализованы
+    """
+    prepared_messages = list(iter_prepared_messages(input_data))
+    logger.info(f"Подготовлено {len(prepared_messages)} сообщений")
+    return prepared_messages
+
 def validate_message_structure(message: Dict[str, Any]) -> bool:
     """
     Валидация структуры отдельного сообщения.
@@ -6,10 +6,14 @@
 """
 
 import logging
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Поля операции в порядке вывода (None значения не выводятся)
+_TEXT_FIELDS = ("date", "division", "operation", "crop")
+_NUMERIC_FIELDS = ("dailyArea", "totalArea", "dailyYield", "totalYield")
+
 def format_output(corrected_data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """
     Форматирование всех исправленных данных в финальную структуру вывода.
@@ -25,16 +29,16 @@ def format_output(corrected_data: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
         
         for message in corrected_data:
             formatted_message = format_message(message)
-            if formatted_message:
+            if formatted_message is not None:
                 formatted_reports.append(formatted_message)
                 
         return {"reports": formatted_reports}
         
     except Exception as e:
-        logger.error(f"Ошибка при форматировании выходных данных: {str(e)}")
+        logger.error("Ошибка при форматировании выходных данных: %s", e)
         return {"reports": []}
 
-def format_message(message: Dict[str, Any]) -> Dict[str, Any]:
+def format_message(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Форматирование отдельного сообщения.
     
@@ -42,7 +46,7 @@ def format_message(message: Dict[str, Any]) -> Dict[str, Any]:
         message (Dict[str, Any]): Сообщение для форматирования
         
     Returns:
-        Dict[str, Any]: Отформатированное сообщение
+        Optional[Dict[str, Any]]: Отформатированное сообщение или None при ошибке
     """
     try:
         formatted = {
@@ -60,8 +64,8 @@ def format_message(message: Dict[str, Any]) -> Dict[str, Any]:
         return formatted
         
     except Exception as e:
-        logger.error(f"Ошибка при форматировании сообщения: {str(e)}")
-        return {}
+        logger.error("Ошибка при форматировании сообщения: %s", e)
+        return None
 
 def format_operation(operation: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -74,24 +78,24 @@ def format_operation(operation: Dict[str, Any]) -> Dict[str, Any]:
         Dict[str, Any]: Отформатированная операция
     """
     try:
-        formatted = {
-            "date": operation.get("date"),
-            "division": operation.get("division"),
-            "operation": operation.get("operation"),
-            "crop": operation.get("crop"),
-            "dailyArea": format_numeric_value(operation.get("dailyArea")),
-            "totalArea": format_numeric_value(operation.get("totalArea")),
-            "dailyYield": format_numeric_value(operation.get("dailyYield")),
-            "totalYield": format_numeric_value(operation.get("totalYield"))
-        }
-        
-        # Удаляем None значения
-        formatted = {k: v for k, v in formatted.items() if v is not None}
+        formatted = {}
         
+        # Текстовые поля
+        for field in _TEXT_FIELDS:
+            value = operation.get(field)
+            if value is not None:
+                formatted[field] = value
+                
+        # Числовые поля
+        for field in _NUMERIC_FIELDS:
+            value = format_numeric_value(operation.get(field))
+            if value is not None:
+                formatted[field] = value
+                
         return formatted
         
     except Exception as e:
-        logger.error(f"Ошибка при форматировании операции: {str(e)}")
+        logger.error("Ошибка при форматировании операции: %s", e)
         return {}
 
 def format_numeric_value(value: Union[int, float, str, None]) -> Union[int, float, None]:
@@ -107,14 +111,23 @@ def format_numeric_value(value: Union[int, float, str, None]) -> Union[int, floa
     if value is None:
         return None
         
+    # Целые значения (основной случай после валидации) не требуют преобразования
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is float:
+        return int(value) if value.is_integer() else value
+        
     try:
-        # Преобразование строки в число
+        # Преобразование строки в число: сначала как целое, затем как дробное
         if isinstance(value, str):
-            value = value.replace(",", ".")
-            if "." in value:
+            try:
+                return int(value)
+            except ValueError:
+                value = value.replace(",", ".")
+                if "." not in value:
+                    raise
                 value = float(value)
-            else:
-                value = int(value)
                 
         # Проверка на целое число
         if isinstance(value, float) and value.is_integer():
@@ -123,5 +136,5 @@ def format_numeric_value(value: Union[int, float, str, None]) -> Union[int, floa
         return value
         
     except (ValueError, TypeError):
-        logger.warning(f"Невозможно преобразовать значение в число: {value}")
-        return None 
\ No newline at end of file
+        logger.warning("Невозможно преобразовать значение в число: %s", value)
+        return None
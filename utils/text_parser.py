@@ -33,12 +33,18 @@
     parsed_data = parse_messages(input_data)
 """
 
+import os
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from utils.input_processor import prepare_messages
+from utils.input_processor import iter_prepared_messages
 from config.reference_data import (
     VALID_OPERATIONS,
     DIVISIONS,
@@ -58,6 +64,54 @@ DEPARTMENT_PATTERN = r'Отд\s+(\d+)\s+(\d+)/(\d+)'  # Отдел и метри
 PRODUCTION_UNIT_PATTERN = r'По\s+([А-Яа-я]+)\s+(\d+)/(\d+)'  # Производственный участок и метрики
 METRICS_PATTERN = r'(\d+)/(\d+)'  # Метрики в формате daily/total
 
+# Кэшированные варианты функций исправления: набор различных операций и
+# культур в данных невелик, поэтому нормализация выполняется один раз на строку
+_correct_operation_cached = lru_cache(maxsize=512)(correct_operation)
+_correct_crop_cached = lru_cache(maxsize=512)(correct_crop)
+
+# Начиная с этого числа сообщений парсинг выполняется в пуле процессов.
+# Парсинг сообщения занимает ~30 мкс, запуск процесса пула - несколько
+# миллисекунд, поэтому каждому процессу передается не меньше
+# PARALLEL_PARSE_CHUNKSIZE сообщений, а число процессов ограничено числом
+# полных порций; пакеты меньше двух порций обрабатываются последовательно
+PARALLEL_PARSE_THRESHOLD = 1024
+PARALLEL_PARSE_CHUNKSIZE = 512
+
+# Скомпилированные выражения
+_DATE_RE = re.compile(DATE_PATTERN)
+_OPERATION_RE = re.compile(OPERATION_PATTERN)
+_METRICS_RE = re.compile(METRICS_PATTERN)
+
+# Объединённый паттерн даты: ISO формат (группы 1-3) или DD.MM[.YYYY] (группы 4-5)
+_DATE_COMBINED_RE = re.compile(
+    r'(?:(\d{4})[-/](\d{1,2})[-/](\d{1,2})|(\d{1,2})[./](\d{1,2})(?:[./]\d{4})?)'
+)
+
+# Окно поиска даты в начале сообщения и длина необязательной части
+# с годом (".YYYY"), на которую совпадение может выйти за границу окна
+_DATE_SEARCH_WINDOW = 64
+_DATE_YEAR_SUFFIX_LENGTH = 5
+
+# Максимальное число дней в месяце (индекс - номер месяца, год неизвестен,
+# поэтому для февраля допускается 29)
+_DAYS_IN_MONTH = b'\x00\x1f\x1d\x1f\x1e\x1f\x1e\x1f\x1f\x1e\x1f\x1e\x1f'
+
+# Отделы и производственные участки ищутся за один проход по блоку:
+# группы 2-4 относятся к отделу, группы 6-8 - к производственному участку
+_DEPARTMENT_OR_UNIT_RE = re.compile(
+    f'(?P<department>{DEPARTMENT_PATTERN})|(?P<unit>{PRODUCTION_UNIT_PATTERN})'
+)
+
+# Шаблоны поиска культуры в порядке приоритета
+_CROP_RES = (
+    re.compile(r'под\s+([А-Яа-я\s\.]+?)(?:\s+|$)'),  # после "под"
+    re.compile(r'по\s+([А-Яа-я\s\.]+?)(?:\s+|$)'),   # после "по"
+    re.compile(r'([А-Яа-я\s\.]+?)\s+(?:Отд|По)'),    # перед "Отд" или "По"
+)
+
+# Названия подразделений в нижнем регистре в порядке DIVISIONS
+_DIVISIONS_LOWER = tuple((division.lower(), division) for division in DIVISIONS)
+
 # Словарь соответствия отделов подразделениям
 DEPARTMENT_TO_DIVISION = {
     range(1, 11): "АОР-1",
@@ -65,6 +119,21 @@ DEPARTMENT_TO_DIVISION = {
     range(21, 31): "АОР-3"
 }
 
+def _build_division_table() -> Tuple[Optional[str], ...]:
+    """
+    Построение таблицы подразделений, индексируемой номером отдела.
+    
+    Returns:
+        Tuple[Optional[str], ...]: Подразделение для каждого номера отдела
+    """
+    table: List[Optional[str]] = [None] * max(r.stop for r in DEPARTMENT_TO_DIVISION)
+    for dept_range, division in DEPARTMENT_TO_DIVISION.items():
+        for dept_num in dept_range:
+            table[dept_num] = division
+    return tuple(table)
+
+_DEPARTMENT_DIVISIONS = _build_division_table()
+
 def get_division_from_department(dept_num: int) -> Optional[str]:
     """
     Определение подразделения по номеру отдела.
@@ -75,14 +144,9 @@ def get_division_from_department(dept_num: int) -> Optional[str]:
     Returns:
         Optional[str]: Название подразделения или None
     """
-    try:
-        for dept_range, division in DEPARTMENT_TO_DIVISION.items():
-            if dept_num in dept_range:
-                return division
-        return None
-    except Exception as e:
-        logger.error(f"Ошибка при определении подразделения: {str(e)}")
-        return None
+    if 0 <= dept_num < len(_DEPARTMENT_DIVISIONS):
+        return _DEPARTMENT_DIVISIONS[dept_num]
+    return None
 
 def parse_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """
@@ -90,7 +154,7 @@ def parse_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str
     
     Эта функция является основной точкой входа для парсинга данных. Она:
     1. Подготавливает сообщения к обработке
-    2. Обрабатывает каждое сообщение отдельно
+    2. Обрабатывает каждое сообщение отдельно (большие пакеты — в пуле процессов)
     3. Собирает результаты в единый список
     
     Args:
@@ -119,28 +183,181 @@ def parse_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str
         Exception: При других ошибках парсинга
     """
     try:
-        # Подготовка сообщений
-        messages = prepare_messages(input_data)
-        parsed_messages = []
+        parsed_messages = list(iter_prepared_messages(input_data))
+        
+        # Парсинг payload: большие пакеты обрабатываются параллельно
+        workers = _parallel_parse_workers(len(parsed_messages))
+        if len(parsed_messages) >= PARALLEL_PARSE_THRESHOLD and workers > 1:
+            results = _parse_payloads_parallel(parsed_messages, workers)
+        else:
+            results = map(_parse_payload_args, _payload_args(parsed_messages))
+        
+        # Обновление сообщений результатами парсинга
+        for message, parsed_operations in zip(parsed_messages, results):
+            message['parsed'] = parsed_operations
+            
+        logger.info("Успешно распарсено %s сообщений", len(parsed_messages))
+        return parsed_messages
+        
+    except Exception as e:
+        logger.error("Ошибка при парсинге сообщений: %s", e)
+        raise
+
+def iter_parse_messages(input_data: Dict[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковый парсинг сообщений во входных данных.
+    
+    В отличие от parse_messages сообщения обрабатываются и возвращаются
+    по одному, так что следующий этап конвейера может обрабатывать их
+    без накопления всего пакета в памяти. Обработка последовательная.
+    
+    Args:
+        input_data (Dict[str, List[Dict[str, Any]]]): Словарь с входными данными
+            (структура как у parse_messages)
+        
+    Yields:
+        Dict[str, Any]: Обработанное сообщение с распарсенными операциями
+        
+    Raises:
+        ValueError: Если входные данные имеют неверный формат
+        Exception: При других ошибках парсинга
+    """
+    try:
+        parsed_count = 0
         
-        for message in messages:
-            # Парсинг payload
-            parsed_operations = parse_message_payload(
+        for message in iter_prepared_messages(input_data):
+            message['parsed'] = parse_message_payload(
                 message['payload'],
                 date=message.get('date')
             )
+            parsed_count += 1
+            yield message
             
-            # Обновление сообщения результатами парсинга
-            message['parsed'] = parsed_operations
-            parsed_messages.append(message)
-            
-        logger.info(f"Успешно распарсено {len(parsed_messages)} сообщений")
-        return parsed_messages
+        logger.info("Успешно распарсено %s сообщений", parsed_count)
         
     except Exception as e:
-        logger.error(f"Ошибка при парсинге сообщений: {str(e)}")
+        logger.error("Ошибка при парсинге сообщений: %s", e)
         raise
 
+def _payload_args(messages: List[Dict[str, Any]]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Формирование аргументов парсинга (payload, date) для списка сообщений.
+    
+    Args:
+        messages (List[Dict[str, Any]]): Подготовленные сообщения
+        
+    Returns:
+        List[Tuple[str, Optional[str]]]: Пары (payload, date)
+    """
+    return [(message['payload'], message.get('date')) for message in messages]
+
+def _parse_payload_args(args: Tuple[str, Optional[str]]) -> List[Dict[str, Any]]:
+    """
+    Парсинг одного сообщения по паре (payload, date).
+    
+    Функция объявлена на уровне модуля, чтобы её можно было передать
+    в пул процессов.
+    
+    Args:
+        args (Tuple[str, Optional[str]]): Текст сообщения и дата
+        
+    Returns:
+        List[Dict[str, Any]]: Список распарсенных операций
+    """
+    payload, date = args
+    return parse_message_payload(payload, date=date)
+
+class _ParentLogHandler(logging.Handler):
+    """
+    Обработчик записей журнала, полученных от процессов пула.
+    
+    Запись передается логгеру с тем же именем в родительском процессе,
+    поэтому она проходит через его обработчики (консоль, app.log).
+    """
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+def _init_parse_worker(log_queue: Any, log_level: int) -> None:
+    """
+    Инициализация процесса пула: записи журнала отправляются в очередь.
+    
+    Унаследованные обработчики удаляются без закрытия: процесс пула
+    завершается через os._exit, и их буферы никогда не были бы записаны.
+    
+    Args:
+        log_queue (Any): Очередь multiprocessing для записей журнала
+        log_level (int): Уровень корневого логгера родительского процесса
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(log_level)
+
+def _parallel_parse_workers(message_count: int) -> int:
+    """
+    Определение числа процессов пула для пакета сообщений.
+    
+    Процессов не больше, чем ядер процессора и полных порций по
+    PARALLEL_PARSE_CHUNKSIZE сообщений: все процессы пула запускаются
+    сразу, и процесс для неполной порции не окупает время запуска.
+    
+    Args:
+        message_count (int): Число сообщений в пакете
+        
+    Returns:
+        int: Число процессов пула
+    """
+    return min(os.cpu_count() or 1, message_count // PARALLEL_PARSE_CHUNKSIZE)
+
+def _parse_payloads_parallel(messages: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """
+    Параллельный парсинг сообщений в пуле процессов.
+    
+    Записи журнала из процессов пула передаются через очередь и
+    обрабатываются в родительском процессе. Если пул процессов недоступен
+    в текущем окружении, сообщения обрабатываются последовательно.
+    
+    Args:
+        messages (List[Dict[str, Any]]): Подготовленные сообщения
+        workers (int): Число процессов пула
+        
+    Returns:
+        List[List[Dict[str, Any]]]: Результаты парсинга в порядке сообщений
+    """
+    args = _payload_args(messages)
+    root_logger = logging.getLogger()
+    
+    # Буферизованные записи журнала сбрасываются до запуска процессов,
+    # чтобы они оказались в файле раньше записей из процессов пула
+    for handler in root_logger.handlers:
+        handler.flush()
+    
+    listener = None
+    try:
+        context = multiprocessing.get_context()
+        log_queue = context.Queue()
+        listener = logging.handlers.QueueListener(log_queue, _ParentLogHandler())
+        listener.start()
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_parse_worker,
+            initargs=(log_queue, root_logger.getEffectiveLevel())
+        ) as executor:
+            return list(executor.map(
+                _parse_payload_args, args, chunksize=PARALLEL_PARSE_CHUNKSIZE
+            ))
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        logger.warning("Пул процессов недоступен, последовательный парсинг: %s", e)
+        return [_parse_payload_args(item) for item in args]
+    finally:
+        # Остановка слушателя дожидается обработки всех записей из очереди
+        if listener is not None:
+            listener.stop()
+
 def parse_message_payload(payload: str, date: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Парсинг текста сообщения.
@@ -182,13 +399,14 @@ def parse_message_payload(payload: str, date: Optional[str] = None) -> List[Dict
         ]
     """
     try:
-        # Извлечение даты если не предоставлена
+        # Дата сообщения; некорректная дата не заменяется датой из текста,
+        # так как поиск по тексту может найти в нем площади вида "5/10"
         message_date = None
         if date:
             message_date = parse_date(date)
-        if not message_date:
+        else:
             # Попробуем найти дату в тексте
-            date_match = re.search(DATE_PATTERN, payload)
+            date_match = _search_payload_date(payload)
             if date_match:
                 message_date = parse_date(date_match.group(0))
                 
@@ -203,9 +421,32 @@ def parse_message_payload(payload: str, date: Optional[str] = None) -> List[Dict
         return parsed_operations
         
     except Exception as e:
-        logger.error(f"Ошибка при парсинге сообщения: {str(e)}")
+        logger.error("Ошибка при парсинге сообщения: %s", e)
         return []
 
+def _search_payload_date(payload: str) -> Optional[re.Match]:
+    """
+    Поиск первой даты в тексте сообщения.
+    
+    Дата обычно указана в начале сообщения, поэтому сначала ищем в первых
+    _DATE_SEARCH_WINDOW символах; по всему тексту - если в начале даты нет
+    или найденная дата может продолжаться за границей окна. Результат
+    совпадает с поиском по всему тексту.
+    
+    Args:
+        payload (str): Текст сообщения
+        
+    Returns:
+        Optional[re.Match]: Найденная дата или None
+    """
+    date_match = _DATE_RE.search(payload, 0, _DATE_SEARCH_WINDOW)
+    if len(payload) > _DATE_SEARCH_WINDOW and (
+        date_match is None
+        or date_match.end() > _DATE_SEARCH_WINDOW - _DATE_YEAR_SUFFIX_LENGTH
+    ):
+        date_match = _DATE_RE.search(payload)
+    return date_match
+
 def split_into_operation_blocks(payload: str) -> List[str]:
     """
     Разделение текста на блоки операций.
@@ -216,12 +457,23 @@ def split_into_operation_blocks(payload: str) -> List[str]:
     Returns:
         List[str]: Список блоков операций
     """
-    # Разделение по пустым строкам
-    blocks = re.split(r'\n\s*\n', payload.strip())
+    # Разделение по пустым (в том числе пробельным) строкам
+    blocks = []
+    current_lines = []
     
-    # Фильтрация пустых блоков
-    return [block.strip() for block in blocks if block.strip()]
+    for line in payload.split('\n'):
+        if line.strip():
+            current_lines.append(line)
+        elif current_lines:
+            blocks.append('\n'.join(current_lines).strip())
+            current_lines.clear()
+            
+    if current_lines:
+        blocks.append('\n'.join(current_lines).strip())
+        
+    return blocks
 
+@lru_cache(maxsize=256)
 def parse_date(date_str: Optional[str]) -> Optional[str]:
     """
     Парсинг даты из строки.
@@ -236,28 +488,25 @@ def parse_date(date_str: Optional[str]) -> Optional[str]:
         return None
         
     try:
-        # Пробуем ISO формат (YYYY-MM-DD)
-        iso_match = re.match(ISO_DATE_PATTERN, date_str)
-        if iso_match:
-            year, month, day = map(int, iso_match.groups())
-            return f"{day:02d}.{month:02d}"
-            
-        # Пробуем стандартный формат (DD.MM или DD.MM.YYYY)
-        match = re.match(DATE_PATTERN, date_str)
+        # ISO формат (YYYY-MM-DD) и стандартный (DD.MM или DD.MM.YYYY) за один вызов
+        match = _DATE_COMBINED_RE.match(date_str)
         if match:
-            day, month, year = match.groups()
+            if match.group(1):
+                month, day = match.group(2, 3)
+            else:
+                day, month = match.group(4, 5)
             day = int(day)
             month = int(month)
             
-            # Проверяем корректность даты
-            if 1 <= month <= 12 and 1 <= day <= 31:
+            # Проверяем корректность даты по таблице дней в месяце
+            if 1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month]:
                 return f"{day:02d}.{month:02d}"
                 
-        logger.warning(f"Не удалось распознать формат даты: {date_str}")
+        logger.warning("Не удалось распознать формат даты: %s", date_str)
         return None
         
     except Exception as e:
-        logger.error(f"Ошибка при парсинге даты {date_str}: {str(e)}")
+        logger.error("Ошибка при парсинге даты %s: %s", date_str, e)
         return None
 
 def parse_operation_block(block: str, date: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -271,84 +520,70 @@ def parse_operation_block(block: str, date: Optional[str] = None) -> List[Dict[s
     Returns:
         List[Dict[str, Any]]: Список распарсенных операций
     """
-    try:
-        # Извлечение основной информации
-        operation_match = re.match(OPERATION_PATTERN, block)
-        if not operation_match:
-            logger.warning(f"Не удалось распознать операцию в блоке: {block}")
-            return []
-            
-        operation, crop = operation_match.groups()
-        operation = correct_operation(operation)
-        
-        # Поиск культуры в тексте
-        crop_patterns = [
-            r'под\s+([А-Яа-я\s\.]+?)(?:\s+|$)',  # после "под"
-            r'по\s+([А-Яа-я\s\.]+?)(?:\s+|$)',   # после "по"
-            r'([А-Яа-я\s\.]+?)\s+(?:Отд|По)',    # перед "Отд" или "По"
-        ]
-        
-        found_crop = None
-        for pattern in crop_patterns:
-            crop_match = re.search(pattern, block)
-            if crop_match:
-                found_crop = crop_match.group(1).strip()
-                found_crop = correct_crop(found_crop)
-                if found_crop:
-                    break
-                    
-        # Если культура не найдена, используем значение из operation_match
-        if not found_crop and crop:
-            found_crop = correct_crop(crop)
-        
-        # Поиск данных по отделам
-        department_matches = re.finditer(DEPARTMENT_PATTERN, block)
-        operations = []
+    # Извлечение основной информации
+    operation_match = _OPERATION_RE.match(block)
+    if not operation_match:
+        logger.warning("Не удалось распознать операцию в блоке: %s", block)
+        return []
         
-        for match in department_matches:
-            dept_num, daily_area, total_area = map(int, match.groups())
+    operation, crop = operation_match.groups()
+    operation = _correct_operation_cached(operation)
+    
+    # Поиск культуры в тексте
+    found_crop = None
+    for pattern in _CROP_RES:
+        crop_match = pattern.search(block)
+        if crop_match:
+            # correct_crop сам удаляет пробельные символы по краям
+            found_crop = _correct_crop_cached(crop_match.group(1))
+            if found_crop:
+                break
+                
+    # Если культура не найдена, используем значение из operation_match
+    if not found_crop and crop:
+        found_crop = _correct_crop_cached(crop)
+    
+    # Поиск данных по отделам и производственным участкам за один проход
+    operations = []
+    unit_operations = []
+    
+    # findall возвращает кортежи из 8 групп: полное совпадение и три
+    # группы отдела, затем полное совпадение и три группы участка
+    for (department, dept_str, dept_daily, dept_total,
+         _, pu_name, pu_daily, pu_total) in _DEPARTMENT_OR_UNIT_RE.findall(block):
+        if department:
+            dept_num = int(dept_str)
             
-            operation_data = {
+            operations.append({
                 'date': date,
                 'operation': operation,
                 'crop': found_crop,
                 'department': dept_num,
-                'dailyArea': daily_area,
-                'totalArea': total_area,
+                'dailyArea': int(dept_daily),
+                'totalArea': int(dept_total),
                 'dailyYield': None,
-                'totalYield': None
-            }
-            
-            # Добавление информации о подразделении
-            division = get_division_from_department(dept_num)
-            if division:
-                operation_data['division'] = division
-                
-            operations.append(operation_data)
-            
-        # Поиск данных по производственным участкам
-        pu_matches = re.finditer(PRODUCTION_UNIT_PATTERN, block)
-        for match in pu_matches:
-            pu_name, daily_area, total_area = match.groups()
-            
-            operation_data = {
+                'totalYield': None,
+                # Подразделение по номеру отдела (None, если отдел вне таблицы)
+                'division': (
+                    _DEPARTMENT_DIVISIONS[dept_num]
+                    if dept_num < len(_DEPARTMENT_DIVISIONS) else None
+                )
+            })
+        else:
+            unit_operations.append({
                 'date': date,
                 'operation': operation,
                 'crop': found_crop,
                 'productionUnit': pu_name,
-                'dailyArea': int(daily_area),
-                'totalArea': int(total_area),
+                'dailyArea': int(pu_daily),
+                'totalArea': int(pu_total),
                 'dailyYield': None,
                 'totalYield': None
-            }
-            
-            operations.append(operation_data)
+            })
             
-        return operations
-        
-    except Exception as e:
-        logger.error(f"Ошибка при парсинге блока операции: {str(e)}")
-        return []
+    # Операции по отделам предшествуют операциям по участкам
+    operations.extend(unit_operations)
+    return operations
 
 def extract_operation(text: str) -> Optional[str]:
     """
@@ -360,10 +595,9 @@ def extract_operation(text: str) -> Optional[str]:
     Returns:
         Optional[str]: Тип операции или None
     """
-    match = re.match(OPERATION_PATTERN, text)
+    match = _OPERATION_RE.match(text)
     if match:
-        operation = match.group(1).strip()
-        return correct_operation(operation)
+        return _correct_operation_cached(match.group(1))
     return None
 
 def extract_crop(text: str) -> Optional[str]:
@@ -376,10 +610,9 @@ def extract_crop(text: str) -> Optional[str]:
     Returns:
         Optional[str]: Название культуры или None
     """
-    match = re.match(OPERATION_PATTERN, text)
+    match = _OPERATION_RE.match(text)
     if match and match.group(2):
-        crop = match.group(2).strip()
-        return correct_crop(crop)
+        return _correct_crop_cached(match.group(2))
     return None
 
 def extract_division(text: str) -> Optional[str]:
@@ -392,8 +625,9 @@ def extract_division(text: str) -> Optional[str]:
     Returns:
         Optional[str]: Название подразделения или None
     """
-    for division in DIVISIONS:
-        if division.lower() in text.lower():
+    text_lower = text.lower()
+    for division_lower, division in _DIVISIONS_LOWER:
+        if division_lower in text_lower:
             return division
     return None
 
@@ -407,8 +641,7 @@ def extract_metrics(text: str) -> Optional[Tuple[int, int]]:
     Returns:
         Optional[Tuple[int, int]]: Кортеж (daily, total) или None
     """
-    match = re.search(METRICS_PATTERN, text)
+    match = _METRICS_RE.search(text)
     if match:
-        daily, total = map(int, match.groups())
-        return daily, total
+        return int(match.group(1)), int(match.group(2))
     return None 
\ No newline at end of file
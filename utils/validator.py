@@ -5,8 +5,10 @@
 Модуль для валидации распарсенных данных.
 """
 
+import re
 import logging
-from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Union
 from difflib import get_close_matches
 
 from config.reference_data import (
@@ -19,41 +21,81 @@ from config.reference_data import (
 
 logger = logging.getLogger(__name__)
 
-def validate_parsed_data(parsed_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# Подразделение по умолчанию, если оно не указано или не распознано
+_DEFAULT_DIVISION = "АОР"
+
+# Множества допустимых значений для проверки точного совпадения
+# (DIVISIONS - словарь, проверка вхождения в нем уже выполняется за O(1))
+_VALID_OPERATIONS_SET = frozenset(VALID_OPERATIONS)
+_VALID_CROPS_SET = frozenset(VALID_CROPS)
+
+# Справочники в нижнем регистре для регистронезависимого поиска
+_OPERATIONS_LOWER = {op.lower(): op for op in VALID_OPERATIONS}
+_CROPS_LOWER = {crop.lower(): crop for crop in VALID_CROPS}
+_DIVISIONS_LOWER = {div.lower(): div for div in DIVISIONS}
+
+# Названия подразделений для нечеткого поиска
+_DIVISION_NAMES = tuple(DIVISIONS)
+
+# Числовые поля операции и их максимальные допустимые значения:
+# площадь до 10000 га, урожайность до 100 т/га
+_NUMERIC_FIELD_LIMITS = (
+    ('dailyArea', 10000),
+    ('totalArea', 10000),
+    ('dailyYield', 100),
+    ('totalYield', 100),
+)
+
+# Все символы, кроме цифр и точки, удаляются из строковых значений
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
+# Ключевые слова для распознавания культуры по общим паттернам
+_CROP_KEYWORDS_RE = re.compile(r'пшеница|ячмень|озим|яров')
+
+def validate_parsed_data(parsed_messages: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Валидация всех распарсенных сообщений.
     
     Args:
-        parsed_messages (List[Dict[str, Any]]): Список распарсенных сообщений
+        parsed_messages (Iterable[Dict[str, Any]]): Распарсенные сообщения
         
     Returns:
         List[Dict[str, Any]]: Список валидированных сообщений
     """
-    validated_messages = []
+    return list(iter_validate_parsed_data(parsed_messages))
+
+def iter_validate_parsed_data(parsed_messages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковая валидация распарсенных сообщений.
+    
+    Сообщения читаются из итератора и возвращаются по одному, поэтому
+    функцию можно соединить с iter_parse_messages без промежуточных списков.
     
+    Args:
+        parsed_messages (Iterable[Dict[str, Any]]): Распарсенные сообщения
+        
+    Yields:
+        Dict[str, Any]: Валидированное сообщение
+    """
     for message in parsed_messages:
         try:
-            # Валидация каждого сообщения
+            # Валидация операций (невалидные операции отбрасываются)
+            parsed_operations = message.get('parsed')
             validated_message = {
                 'message_number': message.get('message_number'),
                 'date': message.get('date'),
                 'payload': message.get('payload'),
-                'parsed': []
+                'parsed': (
+                    list(filter(None, map(validate_operation, parsed_operations)))
+                    if parsed_operations else []
+                )
             }
             
-            # Валидация операций
-            for operation in message.get('parsed', []):
-                validated_operation = validate_operation(operation)
-                if validated_operation:
-                    validated_message['parsed'].append(validated_operation)
-                    
-            validated_messages.append(validated_message)
-            
         except Exception as e:
             logger.error(f"Ошибка при валидации сообщения: {str(e)}")
             continue
             
-    return validated_messages
+        yield validated_message
 
 def validate_operation(operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
@@ -67,16 +109,23 @@ def validate_operation(operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     try:
         # Валидация типа операции
-        operation_type = validate_operation_type(operation.get('operation'))
+        # (пустые значения не передаются в кэшированные функции)
+        raw_operation_type = operation.get('operation')
+        operation_type = (
+            _validate_operation_type_cached(raw_operation_type)
+            if raw_operation_type else None
+        )
         if not operation_type:
-            logger.warning(f"Невалидный тип операции: {operation.get('operation')}")
+            logger.warning(f"Невалидный тип операции: {raw_operation_type}")
             return None
             
         # Валидация культуры
-        crop = validate_crop(operation.get('crop'))
+        crop = operation.get('crop')
+        crop = _validate_crop_cached(crop) if crop else None
         
         # Валидация подразделения
-        division = validate_division(operation.get('division'))
+        division = operation.get('division')
+        division = _validate_division_cached(division) if division else _DEFAULT_DIVISION
         
         # Валидация числовых значений
         validated_operation = validate_numeric_values(operation)
@@ -90,7 +139,8 @@ def validate_operation(operation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         
         return validated_operation
         
-    except Exception as e:
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        # Операция неожиданной структуры (не словарь, нестроковые поля)
         logger.error(f"Ошибка при валидации операции: {str(e)}")
         return None
 
@@ -108,14 +158,13 @@ def validate_operation_type(operation_type: Optional[str]) -> Optional[str]:
         return None
         
     # Точное совпадение
-    if operation_type in VALID_OPERATIONS:
+    if operation_type in _VALID_OPERATIONS_SET:
         return operation_type
         
     # Регистронезависимое совпадение
-    operation_lower = operation_type.lower()
-    for valid_op in VALID_OPERATIONS:
-        if valid_op.lower() == operation_lower:
-            return valid_op
+    valid_op = _OPERATIONS_LOWER.get(operation_type.lower())
+    if valid_op:
+        return valid_op
             
     # Нечеткое совпадение
     matches = get_close_matches(operation_type, VALID_OPERATIONS, n=1, cutoff=0.8)
@@ -125,7 +174,7 @@ def validate_operation_type(operation_type: Optional[str]) -> Optional[str]:
         
     # Попытка исправления через словарь исправлений
     corrected = correct_operation(operation_type)
-    if corrected in VALID_OPERATIONS:
+    if corrected in _VALID_OPERATIONS_SET:
         logger.info(f"Исправлен тип операции через словарь: {operation_type} -> {corrected}")
         return corrected
         
@@ -145,14 +194,14 @@ def validate_crop(crop: Optional[str]) -> Optional[str]:
         return None
         
     # Точное совпадение
-    if crop in VALID_CROPS:
+    if crop in _VALID_CROPS_SET:
         return crop
         
     # Регистронезависимое совпадение
     crop_lower = crop.lower()
-    for valid_crop in VALID_CROPS:
-        if valid_crop.lower() == crop_lower:
-            return valid_crop
+    valid_crop = _CROPS_LOWER.get(crop_lower)
+    if valid_crop:
+        return valid_crop
             
     # Нечеткое совпадение
     matches = get_close_matches(crop, VALID_CROPS, n=1, cutoff=0.8)
@@ -162,16 +211,17 @@ def validate_crop(crop: Optional[str]) -> Optional[str]:
         
     # Попытка исправления через словарь исправлений
     corrected = correct_crop(crop)
-    if corrected in VALID_CROPS:
+    if corrected in _VALID_CROPS_SET:
         logger.info(f"Исправлена культура через словарь: {crop} -> {corrected}")
         return corrected
         
-    # Обработка общих паттернов
-    if "пшеница" in crop_lower and "озим" in crop_lower:
+    # Обработка общих паттернов (ключевые слова ищутся за один проход)
+    keywords = set(_CROP_KEYWORDS_RE.findall(crop_lower))
+    if "пшеница" in keywords and "озим" in keywords:
         return "Озимая пшеница"
-    if "ячмень" in crop_lower and "озим" in crop_lower:
+    if "ячмень" in keywords and "озим" in keywords:
         return "Озимый ячмень"
-    if "ячмень" in crop_lower and "яров" in crop_lower:
+    if "ячмень" in keywords and "яров" in keywords:
         return "Яровой ячмень"
         
     return None
@@ -187,25 +237,31 @@ def validate_division(division: Optional[str]) -> str:
         str: Валидное название подразделения
     """
     if not division:
-        return "АОР"
+        return _DEFAULT_DIVISION
         
     # Точное совпадение
     if division in DIVISIONS:
         return division
         
     # Регистронезависимое совпадение
-    division_lower = division.lower()
-    for valid_div in DIVISIONS:
-        if valid_div.lower() == division_lower:
-            return valid_div
+    valid_div = _DIVISIONS_LOWER.get(division.lower())
+    if valid_div:
+        return valid_div
             
     # Нечеткое совпадение
-    matches = get_close_matches(division, list(DIVISIONS.keys()), n=1, cutoff=0.8)
+    matches = get_close_matches(division, _DIVISION_NAMES, n=1, cutoff=0.8)
     if matches:
         logger.info(f"Исправлено подразделение: {division} -> {matches[0]}")
         return matches[0]
         
-    return "АОР"
+    return _DEFAULT_DIVISION
+
+# Кэшированные варианты функций валидации: результат зависит только от
+# входной строки и справочников, а значения в сообщениях часто повторяются.
+# Кэш покрывает и нечеткий поиск, поэтому отдельно он не кэшируется
+_validate_operation_type_cached = lru_cache(maxsize=2048)(validate_operation_type)
+_validate_crop_cached = lru_cache(maxsize=2048)(validate_crop)
+_validate_division_cached = lru_cache(maxsize=2048)(validate_division)
 
 def validate_numeric_values(operation: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -219,43 +275,36 @@ def validate_numeric_values(operation: Dict[str, Any]) -> Dict[str, Any]:
     """
     validated = operation.copy()
     
-    # Поля для валидации
-    numeric_fields = ['dailyArea', 'totalArea', 'dailyYield', 'totalYield']
-    
-    for field in numeric_fields:
+    for field, max_value in _NUMERIC_FIELD_LIMITS:
         value = operation.get(field)
         if value is None:
+            # Отсутствующие поля (урожайность после парсинга) пропускаются сразу
             continue
             
         try:
             # Преобразование в число
-            if isinstance(value, str):
-                # Удаление пробелов и других символов
-                value = ''.join(c for c in value if c.isdigit() or c == '.')
+            value_type = type(value)
+            if value_type is int or value_type is float:
+                # Числа (основной случай после парсинга) не требуют преобразования
+                num_value = value
+            elif isinstance(value, str):
+                # Удаление пробелов и других символов; строка только из цифр
+                # не требует очистки (isdecimal соответствует классу \d)
+                if not value.isdecimal():
+                    value = _NON_NUMERIC_RE.sub('', value)
                 if not value:
                     validated[field] = None
                     continue
-                    
-            # Преобразование в float или int
-            if '.' in str(value):
-                num_value = float(value)
+                num_value = float(value) if '.' in value else int(value)
             else:
-                num_value = int(value)
+                num_value = float(value) if '.' in str(value) else int(value)
                 
-            # Проверка на разумные значения
-            if field in ['dailyArea', 'totalArea']:
-                if num_value < 0 or num_value > 10000:  # Максимальная площадь 10000 га
-                    logger.warning(f"Нереалистичное значение {field}: {num_value}")
-                    validated[field] = None
-                else:
-                    validated[field] = num_value
-                    
-            elif field in ['dailyYield', 'totalYield']:
-                if num_value < 0 or num_value > 100:  # Максимальная урожайность 100 т/га
-                    logger.warning(f"Нереалистичное значение {field}: {num_value}")
-                    validated[field] = None
-                else:
-                    validated[field] = num_value
+            # Проверка на разумные значения (NaN не проходит проверку)
+            if 0 <= num_value <= max_value:
+                validated[field] = num_value
+            else:
+                logger.warning(f"Нереалистичное значение {field}: {num_value}")
+                validated[field] = None
                     
         except (ValueError, TypeError):
             logger.warning(f"Некорректное значение {field}: {value}")